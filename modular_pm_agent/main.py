@@ -1,9 +1,13 @@
 # main.py
 import argparse
+from datetime import date
 
-from src.models import Team, TeamMember
+from src.models import Team, TeamMember, PlanDiff, WorkCalendar
 from src.graph import build_graph
+from src.replan import save_run, replan_run
+from src.work_calendar import resolve_start_date
 from src.visualization import visualize_results
+from src.export import export_results
 
 
 def build_default_team() -> Team:
@@ -32,32 +36,21 @@ def build_default_team() -> Team:
     )
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Run the modular PM assistant workflow.")
-    parser.add_argument(
-        "--project",
-        type=str,
-        default="Create a secure, multi-user AI dashboard using LangGraph and React.",
-        help="Project description the agent should plan for.",
-    )
-    parser.add_argument(
-        "--max-iter",
-        type=int,
-        default=2,
-        help="Maximum optimization iterations (auditor cycles).",
-    )
-    parser.add_argument(
-        "--thread-id",
-        type=str,
-        default="prod_v1",
-        help="LangGraph thread_id (used for checkpointing / run identity).",
+def build_default_calendar(holidays: str = "") -> WorkCalendar:
+    """Mon-Fri workweek; holidays given as comma-separated ISO dates."""
+    return WorkCalendar(
+        holidays=[date.fromisoformat(d.strip()) for d in holidays.split(",") if d.strip()]
     )
-    args = parser.parse_args()
 
+
+def run_workflow(args) -> dict:
+    """Full run from the scoper onward; the result is saved for later --replan."""
     # 1) Define Team
     my_team = build_default_team()
 
     # 2) Define Initial State
+    # The start date is pinned now so saved runs and re-plans keep their dates
+    calendar = build_default_calendar(args.holidays)
     init_state = {
         "project_description": args.project,
         "team": my_team,
@@ -65,6 +58,10 @@ def main():
         "max_iteration": args.max_iter,
         "insights": [],
         "project_risk_score_iterations": [],
+        "beam_width": args.beam_width,
+        "beam": [],
+        "calendar": calendar,
+        "start_date": resolve_start_date(calendar, args.start_date),
     }
 
     # 3) Build & Run
@@ -75,10 +72,81 @@ def main():
     final_state = graph.invoke(init_state, {"configurable": {"thread_id": args.thread_id}})
 
     print("Workflow Finished!")
+    print(f"[INFO] Run saved to '{save_run(final_state, args.thread_id)}'")
+    return final_state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the modular PM assistant workflow.")
+    parser.add_argument(
+        "--project",
+        type=str,
+        default="Create a secure, multi-user AI dashboard using LangGraph and React.",
+        help="Project description the agent should plan for.",
+    )
+    parser.add_argument(
+        "--max-iter",
+        type=int,
+        default=2,
+        help="Maximum optimization iterations (auditor cycles).",
+    )
+    parser.add_argument(
+        "--beam-width",
+        type=int,
+        default=1,
+        help="Candidate insights evaluated in parallel per optimizer round (1 = sequential).",
+    )
+    parser.add_argument(
+        "--thread-id",
+        type=str,
+        default="prod_v1",
+        help="LangGraph thread_id (used for checkpointing / run identity).",
+    )
+    parser.add_argument(
+        "--start-date",
+        type=date.fromisoformat,
+        default=None,
+        help="Project start date (YYYY-MM-DD). Defaults to the next working day; saved with the run.",
+    )
+    parser.add_argument(
+        "--holidays",
+        type=str,
+        default="",
+        help="Comma-separated non-working dates, e.g. 2026-12-25,2027-01-01.",
+    )
+    parser.add_argument(
+        "--export",
+        type=str,
+        default="jsonl",
+        help="Comma-separated export formats: jsonl, parquet (needs pyarrow). Empty to skip.",
+    )
+    parser.add_argument(
+        "--replan",
+        type=str,
+        default=None,
+        help="Path to a JSON PlanDiff applied incrementally to the saved run of --thread-id.",
+    )
+    args = parser.parse_args()
+
+    if args.replan:
+        with open(args.replan) as f:
+            diff = PlanDiff.model_validate_json(f.read())
+        print(f"Re-planning run '{args.thread_id}'...")
+        final_state = replan_run(args.thread_id, diff)
+    else:
+        final_state = run_workflow(args)
 
     # 4) Report
     visualize_results(final_state)
 
+    # 5) Export for downstream analytics
+    if args.export:
+        export_results(
+            final_state,
+            thread_id=args.thread_id,
+            formats=[f.strip() for f in args.export.split(",") if f.strip()],
+        )
+
 
 if __name__ == "__main__":
     main()
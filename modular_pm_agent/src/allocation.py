@@ -0,0 +1,139 @@
+import difflib
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from src.models import Task, TeamMember, TaskAllocation
+from src.leveling import skill_tokens
+
+# Score weights: skill fit dominates, load spreads work among equally skilled
+# members, seniority only breaks what is left. A member's load penalty reaches
+# LOAD_WEIGHT at the team's average load, so skill still wins until someone
+# carries several times the average.
+SKILL_WEIGHT = 1.0
+LOAD_WEIGHT = 0.2
+# Bonus for a preferred member: the previous assignee or an LLM tie-break
+# pick (smaller than any real skill gap)
+PREFERENCE_BONUS = 0.05
+# Costs are quantized to integers: exact ties keep the solver fast and stable
+COST_RESOLUTION = 10_000
+
+SENIORITY_LEVELS = {"junior": 0.0, "mid": 0.5, "senior": 1.0, "lead": 1.0}
+
+
+# --- Helper: Name Resolution ---
+def resolve_member_name(name: str, members: List[TeamMember]) -> Optional[TeamMember]:
+    """Exact, then case-insensitive, then fuzzy match, so "alice " or "Alcie" still resolve."""
+    by_name = {m.name: m for m in members}
+    if name in by_name:
+        return by_name[name]
+    by_lower = {m.name.lower(): m for m in members}
+    key = str(name).strip().lower()
+    if key in by_lower:
+        return by_lower[key]
+    close = difflib.get_close_matches(key, list(by_lower), n=1, cutoff=0.75)
+    return by_lower[close[0]] if close else None
+
+
+# --- Score Matrix ---
+def skill_score_matrix(tasks: List[Task], members: List[TeamMember]) -> np.ndarray:
+    """task x member fit: share of the task's required skills the member covers."""
+    task_sets = [skill_tokens(t.required_skill) for t in tasks]
+    member_sets = [skill_tokens(m.skills) for m in members]
+    vocab = {tok: i for i, tok in enumerate(sorted(set().union(*task_sets, *member_sets)))}
+
+    required = np.zeros((len(tasks), len(vocab)))
+    for i, s in enumerate(task_sets):
+        required[i, [vocab[t] for t in s]] = 1.0
+    offered = np.zeros((len(members), len(vocab)))
+    for j, s in enumerate(member_sets):
+        offered[j, [vocab[t] for t in s]] = 1.0
+
+    n_required = required.sum(axis=1, keepdims=True)
+    overlap = np.where(
+        n_required > 0, (required @ offered.T) / np.maximum(n_required, 1), 1.0
+    )
+    return SKILL_WEIGHT * overlap
+
+
+def tied_tasks(tasks: List[Task], scores: np.ndarray, tol: float = 1e-9) -> List[Task]:
+    """Tasks whose best two members score the same (candidates for an LLM tie-break)."""
+    if scores.shape[1] < 2:
+        return []
+    top2 = -np.partition(-scores, 1, axis=1)[:, :2]
+    return [t for t, (a, b) in zip(tasks, top2) if a - b <= tol]
+
+
+# --- Solver ---
+def solve_assignment(
+    tasks: List[Task],
+    members: List[TeamMember],
+    load: Optional[Dict[str, float]] = None,
+    preferences: Optional[Dict[str, str]] = None,
+    scores: Optional[np.ndarray] = None,
+) -> List[TaskAllocation]:
+    """
+    Balanced min-cost assignment that lets a member take several tasks.
+
+    Each member is expanded into slots. Slot k is the member's k-th task
+    counted from the last one, so a task of d days placed there pushes back
+    k finishes by d days (on top of the member's existing `load`), scaled by
+    capacity. A single rectangular assignment over tasks x slots then
+    minimises skill misfit plus the members' summed finish times, which
+    balances booked days, not task counts, among members with the same skill
+    fit. Deterministic for the same inputs.
+    """
+    if not tasks or not members:
+        return []
+    load = load or {}
+    preferences = preferences or {}
+    if scores is None:
+        scores = skill_score_matrix(tasks, members)
+    scores = scores.copy()
+
+    member_idx = {m.name: j for j, m in enumerate(members)}
+    for i, t in enumerate(tasks):
+        j = member_idx.get(preferences.get(t.id))
+        if j is not None:
+            scores[i, j] += PREFERENCE_BONUS
+
+    n_tasks, n_members = scores.shape
+    days = np.array([max(1, t.estimated_day) for t in tasks], dtype=float)
+    capacity = np.array([max(1, m.capacity) for m in members], dtype=float)
+    base_load = np.array([load.get(m.name, 0.0) for m in members])
+
+    # Slots per member: a fair share plus its split of the tasks it is a best
+    # fit for. Every group of equally skilled members then has room for all of
+    # its tasks, so a scarce skill is never pushed onto someone who lacks it.
+    best_fit = scores >= scores.max(axis=1, keepdims=True) - 1e-9
+    best_share = (best_fit / best_fit.sum(axis=1, keepdims=True)).sum(axis=0)
+    fair_share = math.ceil(n_tasks / n_members) + 1
+    slots = np.minimum(n_tasks, fair_share + np.ceil(best_share).astype(int))
+
+    # Column c is slot `col_slot[c]` (1-based) of member `col_member[c]`
+    col_member = np.repeat(np.arange(n_members), slots)
+    col_slot = np.arange(len(col_member)) - np.repeat(np.cumsum(slots) - slots, slots) + 1
+
+    # Finish-time delay per unit of capacity, relative to the team average load
+    average = max(1.0, (base_load.sum() + days.sum()) / capacity.sum())
+    scale = LOAD_WEIGHT / capacity[col_member] / average
+    penalty = (base_load[col_member] + days[:, None] * col_slot) * scale
+
+    # Seniority: worth less than half of the smallest one-slot load step and
+    # of a preference, so it only breaks what is left
+    step = min(LOAD_WEIGHT * days.min() / capacity.max() / average, PREFERENCE_BONUS)
+    seniority = np.array(
+        [SENIORITY_LEVELS.get(m.seniority.strip().lower(), 0.5) for m in members]
+    )
+    penalty -= 0.5 * step * seniority[col_member]
+
+    cost = -scores[:, col_member] + penalty
+    cost = np.rint(cost * COST_RESOLUTION).astype(np.int64)
+    rows, cols = linear_sum_assignment(cost)
+
+    return [
+        TaskAllocation(task=tasks[i], team_member=members[col_member[c]])
+        for i, c in sorted(zip(rows, cols))
+    ]
@@ -11,3 +11,9 @@ LLM_MODEL = "llama-3.3-70b-versatile"
 TEMPERATURE = 0.3
 
 llm = ChatGroq(model=LLM_MODEL, temperature=TEMPERATURE)
+
+# Beam search: upper bound on concurrent candidate evaluations
+BEAM_MAX_WORKERS = 8
+
+# Allocator: ask the LLM to break exact skill ties (solver is deterministic without it)
+ALLOCATOR_LLM_TIEBREAK = False
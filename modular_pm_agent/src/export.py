@@ -0,0 +1,229 @@
+import json
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+from src.leveling import build_task_map, resolve_task_key
+
+# Parquet is optional: JSONL export works without pyarrow
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+EXPORT_DIR = os.path.join("outputs", "exports")
+FORMATS = ("jsonl", "parquet")
+
+
+# --- Row Builders ---
+def plan_rows(
+    state, run_id: str, thread_id: Optional[str] = None
+) -> Dict[str, List[dict]]:
+    """Flatten a finished state into one list of flat rows per table."""
+    common = {
+        "run_id": run_id,
+        "thread_id": thread_id,
+        "project": state.get("project_description"),
+        "exported_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    tasks = state["tasks"].task if state.get("tasks") else []
+    schedule = state["schedule"].schedule if state.get("schedule") else []
+    allocs = (
+        state["task_allocations"].task_allocations if state.get("task_allocations") else []
+    )
+    risks = state["risks"].risks if state.get("risks") else []
+
+    # The mapper may name tasks instead of using ids; export canonical ids only
+    # and drop edges whose ends are not in the plan
+    task_map = build_task_map(state["tasks"]) if tasks else {}
+    edges = dict.fromkeys(
+        (resolve_task_key(task_map, d.task_id), resolve_task_key(task_map, dep))
+        for d in state.get("dependencies") or []
+        for dep in d.dependent_on
+    )
+
+    return {
+        "tasks": [
+            {
+                **common,
+                "task_id": t.id,
+                "task_name": t.task_name,
+                "task_description": t.task_description,
+                "estimated_day": t.estimated_day,
+                "required_skill": t.required_skill,
+            }
+            for t in tasks
+        ],
+        "dependencies": [
+            {**common, "task_id": t_id, "depends_on": dep_id}
+            for t_id, dep_id in edges
+            if t_id and dep_id
+        ],
+        "schedule": [
+            {
+                **common,
+                "task_id": s.task.id,
+                "start_day": s.start_day,
+                "end_day": s.end_day,
+                "start_date": s.start_date,
+                "end_date": s.end_date,
+            }
+            for s in schedule
+        ],
+        "allocations": [
+            {
+                **common,
+                "task_id": a.task.id,
+                "member_name": a.team_member.name,
+                "member_role": a.team_member.role,
+            }
+            for a in allocs
+        ],
+        "risks": [
+            {**common, "task_name": r.task_name, "score": r.score, "reason": r.reason}
+            for r in risks
+        ],
+        "risk_history": [
+            {**common, "iteration": i, "score": score}
+            for i, score in enumerate(state.get("project_risk_score_iterations") or [])
+        ],
+    }
+
+
+def arrow_schemas() -> Dict[str, "pa.Schema"]:
+    """Fixed column types so files from different runs read as one dataset."""
+    common = [
+        ("run_id", pa.string()),
+        ("thread_id", pa.string()),
+        ("project", pa.string()),
+        ("exported_at", pa.string()),
+    ]
+    return {
+        "tasks": pa.schema(
+            common
+            + [
+                ("task_id", pa.string()),
+                ("task_name", pa.string()),
+                ("task_description", pa.string()),
+                ("estimated_day", pa.int64()),
+                ("required_skill", pa.string()),
+            ]
+        ),
+        "dependencies": pa.schema(
+            common + [("task_id", pa.string()), ("depends_on", pa.string())]
+        ),
+        "schedule": pa.schema(
+            common
+            + [
+                ("task_id", pa.string()),
+                ("start_day", pa.int64()),
+                ("end_day", pa.int64()),
+                ("start_date", pa.date32()),
+                ("end_date", pa.date32()),
+            ]
+        ),
+        "allocations": pa.schema(
+            common
+            + [
+                ("task_id", pa.string()),
+                ("member_name", pa.string()),
+                ("member_role", pa.string()),
+            ]
+        ),
+        "risks": pa.schema(
+            common
+            + [("task_name", pa.string()), ("score", pa.int64()), ("reason", pa.string())]
+        ),
+        "risk_history": pa.schema(
+            common + [("iteration", pa.int64()), ("score", pa.int64())]
+        ),
+    }
+
+
+# --- Exporter ---
+class PlanExporter:
+    """
+    Streams plans to disk one run at a time, without building DataFrames.
+
+    - jsonl:   <out_dir>/jsonl/<table>.jsonl, append-only across runs.
+    - parquet: <out_dir>/parquet/<table>/part-<batch_id>.parquet, one row group
+               per run. Each table directory reads as a single dataset.
+               Files are only complete after close().
+    """
+
+    def __init__(
+        self,
+        out_dir: str = EXPORT_DIR,
+        formats: Sequence[str] = ("jsonl",),
+        batch_id: Optional[str] = None,
+    ):
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown export format(s): {sorted(unknown)}")
+        if "parquet" in formats and pa is None:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow).")
+        self.out_dir = out_dir
+        self.formats = tuple(formats)
+        self.batch_id = batch_id or uuid.uuid4().hex[:12]
+        self._jsonl = {}
+        self._parquet = {}
+        self._schemas = arrow_schemas() if "parquet" in self.formats else {}
+
+    def write(self, state, run_id: Optional[str] = None, thread_id: Optional[str] = None) -> str:
+        run_id = run_id or uuid.uuid4().hex
+        for table, rows in plan_rows(state, run_id, thread_id).items():
+            if not rows:
+                continue
+            if "jsonl" in self.formats:
+                f = self._jsonl_file(table)
+                f.write("".join(json.dumps(r, default=str) + "\n" for r in rows))
+                f.flush()
+            if "parquet" in self.formats:
+                batch = pa.Table.from_pylist(rows, schema=self._schemas[table])
+                self._parquet_writer(table).write_table(batch)
+        return run_id
+
+    def _jsonl_file(self, table: str):
+        if table not in self._jsonl:
+            path = os.path.join(self.out_dir, "jsonl", f"{table}.jsonl")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._jsonl[table] = open(path, "a", encoding="utf-8")
+        return self._jsonl[table]
+
+    def _parquet_writer(self, table: str):
+        if table not in self._parquet:
+            path = os.path.join(
+                self.out_dir, "parquet", table, f"part-{self.batch_id}.parquet"
+            )
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._parquet[table] = pq.ParquetWriter(path, self._schemas[table])
+        return self._parquet[table]
+
+    def close(self):
+        for f in self._jsonl.values():
+            f.close()
+        for w in self._parquet.values():
+            w.close()
+        self._jsonl, self._parquet = {}, {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_results(
+    final_state,
+    run_id: Optional[str] = None,
+    thread_id: Optional[str] = None,
+    formats: Sequence[str] = ("jsonl",),
+    out_dir: str = EXPORT_DIR,
+) -> str:
+    """Export a single finished run; batch jobs should keep one PlanExporter open instead."""
+    with PlanExporter(out_dir, formats) as exporter:
+        run_id = exporter.write(final_state, run_id=run_id, thread_id=thread_id)
+    print(f"[INFO] Exported run '{run_id}' ({', '.join(formats)}) to '{out_dir}'")
+    return run_id
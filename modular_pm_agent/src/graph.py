@@ -3,8 +3,8 @@ from langgraph.checkpoint.memory import MemorySaver
 from src.state import AgentState
 from src.nodes import (
     scope_decomposition_node, dependency_mapping_node, 
-    smart_scheduler_node, resource_allocation_node, 
-    risk_audit_node, optimization_insight_node
+    smart_scheduler_node, resource_allocation_node, resource_leveling_node,
+    risk_audit_node, optimization_insight_node, beam_optimizer_node
 )
 
 def routing_logic(state: AgentState):
@@ -13,6 +13,9 @@ def routing_logic(state: AgentState):
 
     if state["iteration_number"] >= state["max_iteration"] or last_score < 15:
         return END
+    # Beam mode evaluates several candidate insights per round instead of one
+    if state.get("beam_width", 1) > 1:
+        return "beam"
     return "optimizer"
 
 def build_graph():
@@ -23,16 +26,20 @@ def build_graph():
     workflow.add_node("mapper", dependency_mapping_node)
     workflow.add_node("scheduler", smart_scheduler_node)
     workflow.add_node("allocator", resource_allocation_node)
+    workflow.add_node("leveler", resource_leveling_node)
     workflow.add_node("auditor", risk_audit_node)
     workflow.add_node("optimizer", optimization_insight_node)
+    workflow.add_node("beam", beam_optimizer_node)
 
     # Add Edges
     workflow.set_entry_point("scoper")
     workflow.add_edge("scoper", "mapper")
     workflow.add_edge("mapper", "scheduler")
     workflow.add_edge("scheduler", "allocator")
-    workflow.add_edge("allocator", "auditor")
+    workflow.add_edge("allocator", "leveler")
+    workflow.add_edge("leveler", "auditor")
     workflow.add_conditional_edges("auditor", routing_logic)
     workflow.add_edge("optimizer", "scheduler")
+    workflow.add_conditional_edges("beam", routing_logic)
 
     return workflow.compile(checkpointer=MemorySaver())
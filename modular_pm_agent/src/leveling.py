@@ -0,0 +1,298 @@
+import heapq
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from src.models import (
+    Task,
+    Team,
+    TeamMember,
+    TaskList,
+    Dependency,
+    Schedule,
+    TaskSchedule,
+    TaskAllocation,
+    TaskAllocationList,
+    OverAllocation,
+)
+
+
+# --- Helper: Skill Matching ---
+def skill_tokens(skills) -> set:
+    """Normalize "Python, React/UI" or ["Python", "React"] into {"python", "react", "ui"}."""
+    if isinstance(skills, str):
+        skills = [skills]
+    tokens = set()
+    for s in skills:
+        tokens.update(t for t in re.split(r"[,/;|&]+", s.lower()) if t.strip())
+    return {t.strip() for t in tokens} - {"general"}
+
+
+def skill_match(task: Task, member: TeamMember) -> float:
+    """Share of the task's required skills the member has (1.0 for generic tasks)."""
+    required = skill_tokens(task.required_skill)
+    if not required:
+        return 1.0
+    return len(required & skill_tokens(member.skills)) / len(required)
+
+
+# --- Helper: Dependency Graph ---
+def resolve_task_key(task_map: Dict[str, Task], key: str) -> Optional[str]:
+    """Map an id or a task name (the mapper returns either) to the task id."""
+    task = task_map.get(str(key))
+    return task.id if task else None
+
+
+def build_task_map(tasks: TaskList) -> Dict[str, Task]:
+    task_map = {t.id: t for t in tasks.task}
+    task_map.update({t.task_name: t for t in tasks.task})
+    return task_map
+
+
+def predecessor_map(
+    task_map: Dict[str, Task], dependencies: List[Dependency]
+) -> Dict[str, List[str]]:
+    preds = defaultdict(list)
+    for dep in dependencies or []:
+        t_id = resolve_task_key(task_map, dep.task_id)
+        if not t_id:
+            continue
+        for d in dep.dependent_on:
+            d_id = resolve_task_key(task_map, d)
+            if d_id and d_id != t_id and d_id not in preds[t_id]:
+                preds[t_id].append(d_id)
+    return preds
+
+
+def successor_map(preds: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    succs = defaultdict(list)
+    for t_id, ps in preds.items():
+        for p in ps:
+            succs[p].append(t_id)
+    return succs
+
+
+def topological_order(order: List[str], preds: Dict[str, List[str]], key) -> List[str]:
+    """Kahn's algorithm, picking the smallest `key` among ready tasks. Cycles are broken."""
+    succs = successor_map(preds)
+    index = {t: i for i, t in enumerate(order)}
+    indegree = {t: len(preds.get(t, [])) for t in order}
+    heap = [(key(t), index[t], t) for t in order if indegree[t] == 0]
+    heapq.heapify(heap)
+    result, done = [], set()
+    while len(result) < len(order):
+        if not heap:
+            # Cycle left by the mapper: release the earliest remaining task
+            t = min((t for t in order if t not in done), key=lambda t: (key(t), index[t]))
+            heapq.heappush(heap, (key(t), index[t], t))
+        *_, t = heapq.heappop(heap)
+        if t in done:
+            continue
+        done.add(t)
+        result.append(t)
+        for s in succs[t]:
+            indegree[s] -= 1
+            if indegree[s] == 0 and s not in done:
+                heapq.heappush(heap, (key(s), index[s], s))
+    return result
+
+
+# --- Per-member Timeline ---
+class MemberTimeline:
+    """
+    Sorted busy blocks for one member. Touching bookings are merged into one
+    block, so a query jumps over a packed stretch of work in a single step
+    instead of walking it task by task.
+    One lane per unit of capacity, so a member with capacity 2 can hold two
+    overlapping tasks but never three.
+    """
+
+    def __init__(self, capacity: int = 1):
+        self.lanes = [([], []) for _ in range(max(1, capacity))]
+
+    @staticmethod
+    def _lane_slot(lane, start: int, duration: int) -> int:
+        starts, ends = lane
+        t = start
+        i = bisect_right(ends, t)  # first interval still busy at t
+        while i < len(starts) and starts[i] < t + duration:
+            t = max(t, ends[i])
+            i += 1
+        return t
+
+    def earliest_slot(self, start: int, duration: int) -> Tuple[int, int]:
+        """Earliest day >= start with `duration` free days, and the lane it fits in."""
+        return min(
+            (self._lane_slot(lane, start, duration), i)
+            for i, lane in enumerate(self.lanes)
+        )
+
+    def block(self, day: int):
+        """Day off: no lane can take work on it."""
+        for i, lane in enumerate(self.lanes):
+            if self._lane_slot(lane, day, 1) == day:
+                self.book(day, day + 1, i)
+
+    def book(self, start: int, end: int, lane_idx: int):
+        starts, ends = self.lanes[lane_idx]
+        # Blocks i..j-1 touch [start, end); they become one block
+        i = bisect_left(ends, start)
+        j = bisect_right(starts, end)
+        if i < j:
+            start, end = min(start, starts[i]), max(end, ends[j - 1])
+        starts[i:j] = [start]
+        ends[i:j] = [end]
+
+
+# --- Detection ---
+def find_overallocations(
+    schedule: Schedule, allocations: TaskAllocationList, team: Team
+) -> List[OverAllocation]:
+    """Sweep-line over each member's booked ranges: O(n log n) in the number of tasks."""
+    sched_map = {item.task.id: item for item in schedule.schedule}
+    events = defaultdict(list)
+    for a in allocations.task_allocations:
+        item = sched_map.get(a.task.id)
+        if item:
+            events[a.team_member.name].append((item.start_day, 1))
+            events[a.team_member.name].append((item.end_day, -1))
+
+    capacity = {m.name: m.capacity for m in team.team_members}
+    found = []
+    for name, evs in events.items():
+        cap = capacity.get(name, 1)
+        evs.sort()  # at equal days -1 sorts first: end_day is exclusive
+        load, open_at = 0, None
+        for i, (day, delta) in enumerate(evs):
+            load += delta
+            last_at_day = i + 1 == len(evs) or evs[i + 1][0] != day
+            if not last_at_day:
+                continue
+            if load > cap and open_at is None:
+                open_at, peak = day, load
+            elif load > cap:
+                peak = max(peak, load)
+            elif open_at is not None:
+                found.append(
+                    OverAllocation(
+                        member_name=name,
+                        start_day=open_at,
+                        end_day=day,
+                        load=peak,
+                        capacity=cap,
+                    )
+                )
+                open_at = None
+    return found
+
+
+# --- Leveling ---
+def level_resources(
+    tasks: TaskList,
+    dependencies: List[Dependency],
+    schedule: Schedule,
+    allocations: TaskAllocationList,
+    team: Team,
+    days_off: Optional[Dict[str, List[int]]] = None,
+) -> Tuple[Schedule, TaskAllocationList]:
+    """
+    Serial schedule generation: tasks are placed in dependency order, critical
+    ones first, each at the earliest day its member is free. A task that would
+    slip past its slack is moved to an equally skilled member when that member
+    can start it sooner. `days_off` blocks working-day offsets per member, so
+    a task is never placed across its assignee's day off.
+    """
+    task_map = build_task_map(tasks)
+    sched_map = {item.task.id: item for item in schedule.schedule}
+    alloc_map = {a.task.id: a.team_member for a in allocations.task_allocations}
+    members = team.team_members
+    # Unscheduled tasks hold no dates: they neither book capacity nor push successors
+    order = [t.id for t in tasks.task if t.id in sched_map]
+    preds = defaultdict(list)
+    for t_id, ps in predecessor_map(task_map, dependencies).items():
+        if t_id in sched_map:
+            preds[t_id] = [p for p in ps if p in sched_map]
+    succs = successor_map(preds)
+
+    start, dur = {}, {}
+    for t_id in order:
+        item = sched_map[t_id]
+        start[t_id] = item.start_day
+        dur[t_id] = max(1, item.end_day - item.start_day)
+
+    # Latest start without delaying the current finish (backward pass)
+    project_end = max((start[t] + dur[t] for t in order), default=0)
+    latest = {}
+    for t_id in reversed(topological_order(order, preds, key=lambda t: start[t])):
+        latest_end = min(
+            (latest[s] for s in succs[t_id] if s in latest), default=project_end
+        )
+        latest[t_id] = max(start[t_id], latest_end - dur[t_id])
+
+    # Latest-start priority: critical (zero-slack) work books its member before
+    # earlier-starting tasks that can still slide
+    placed = topological_order(order, preds, key=lambda t: (latest[t], start[t]))
+
+    # Tokenize skills once: re-assignment compares them for every slipping task
+    required = {t_id: skill_tokens(task_map[t_id].required_skill) for t_id in order}
+    offered = {m.name: skill_tokens(m.skills) for m in members}
+
+    def fit(t_id: str, name: str) -> float:
+        if not required[t_id]:
+            return 1.0
+        return len(required[t_id] & offered[name]) / len(required[t_id])
+
+    timelines = {m.name: MemberTimeline(m.capacity) for m in members}
+    for name, days in (days_off or {}).items():
+        if name in timelines:
+            for day in days:
+                timelines[name].block(day)
+    new_start, new_member = {}, {}
+    moved = reassigned = 0
+    for t_id in placed:
+        est = max(
+            [start[t_id]] + [new_start[p] + dur[p] for p in preds[t_id] if p in new_start]
+        )
+        member = alloc_map.get(t_id)
+        if member is None or member.name not in timelines:
+            # Unallocated tasks only honour dependencies
+            new_start[t_id] = est
+            continue
+
+        slot, lane = timelines[member.name].earliest_slot(est, dur[t_id])
+        if slot > latest[t_id]:
+            base = fit(t_id, member.name)
+            for alt in members:
+                if alt.name == member.name or fit(t_id, alt.name) < base:
+                    continue
+                alt_slot, alt_lane = timelines[alt.name].earliest_slot(est, dur[t_id])
+                if alt_slot < slot:
+                    member, slot, lane = alt, alt_slot, alt_lane
+
+        timelines[member.name].book(slot, slot + dur[t_id], lane)
+        new_start[t_id] = slot
+        new_member[t_id] = member
+        moved += slot != start[t_id]
+        reassigned += member.name != alloc_map[t_id].name
+
+    print(f"Leveling: shifted {moved} task(s), reassigned {reassigned} task(s).")
+
+    leveled = Schedule(
+        schedule=[
+            TaskSchedule(
+                task=task_map[t_id],
+                start_day=new_start[t_id],
+                end_day=new_start[t_id] + dur[t_id],
+            )
+            for t_id in order
+        ]
+    )
+    leveled_allocs = TaskAllocationList(
+        task_allocations=[
+            TaskAllocation(task=task_map[t.id], team_member=new_member.get(t.id) or alloc_map[t.id])
+            for t in tasks.task
+            if t.id in new_member or t.id in alloc_map
+        ]
+    )
+    return leveled, leveled_allocs
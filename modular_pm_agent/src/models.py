@@ -1,4 +1,5 @@
-from typing import List, Optional, Any, Annotated
+from datetime import date
+from typing import Dict, List, Optional, Any, Annotated
 from pydantic import BaseModel, Field, AliasChoices, BeforeValidator, model_validator
 
 
@@ -70,12 +71,22 @@ class TeamMember(BaseModel):
     role: str
     skills: List[str]
     seniority: str
+    # Max tasks this member can work on at the same time
+    capacity: int = 1
 
 
 class Team(BaseModel):
     team_members: List[TeamMember]
 
 
+class WorkCalendar(BaseModel):
+    # numpy busday weekmask, Monday first: "1111100" = Mon-Fri
+    weekmask: str = "1111100"
+    holidays: List[date] = []
+    # Extra days off per member (vacation, part-time), on top of shared holidays
+    member_unavailable: Dict[str, List[date]] = {}
+
+
 # --- Workflow Containers ---
 
 
@@ -161,6 +172,9 @@ class TaskSchedule(BaseModel):
     task: Task
     start_day: int
     end_day: int
+    # Filled from the working calendar: first and last working day of the task
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
 
 
 class Schedule(BaseModel):
@@ -237,3 +251,61 @@ class RiskList(BaseModel):
         if isinstance(target, list):
             return {"risks": target}
         return data
+
+
+class OverAllocation(BaseModel):
+    member_name: str
+    start_day: int
+    end_day: int
+    load: int
+    capacity: int
+
+
+class PlanCandidate(BaseModel):
+    """One evaluated plan kept on the optimizer beam."""
+
+    insights: List[str]
+    schedule: Schedule
+    task_allocations: TaskAllocationList
+    risks: RiskList
+    score: int
+
+
+# --- Re-planning ---
+
+
+class TaskEdit(BaseModel):
+    id: str
+    task_name: Optional[str] = None
+    task_description: Optional[str] = None
+    estimated_day: Optional[int] = None
+    required_skill: Optional[FlexibleString] = None
+
+
+class PlanDiff(BaseModel):
+    add_tasks: List[Task] = []
+    # Optional explicit edges for added tasks; the mapper is only asked when missing
+    add_dependencies: List[Dependency] = []
+    remove_tasks: List[str] = []
+    edit_tasks: List[TaskEdit] = []
+    add_members: List[TeamMember] = []
+    remove_members: List[str] = []
+    brief_amendment: Optional[str] = None
+
+
+class PlanSnapshot(BaseModel):
+    """Persisted state of a finished run, keyed by thread_id."""
+
+    project_description: str
+    team: Team
+    tasks: TaskList
+    dependencies: List[Dependency] = []
+    schedule: Schedule
+    task_allocations: TaskAllocationList
+    risks: Optional[RiskList] = None
+    iteration_number: int = 0
+    max_iteration: int = 0
+    insights: List[str] = []
+    project_risk_score_iterations: List[int] = []
+    calendar: Optional[WorkCalendar] = None
+    start_date: Optional[date] = None
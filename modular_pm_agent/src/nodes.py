@@ -1,18 +1,29 @@
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Any, Optional, Annotated
 from pydantic import BaseModel, Field, AliasChoices, model_validator, BeforeValidator
-from src.config import llm
+from src.config import llm, BEAM_MAX_WORKERS, ALLOCATOR_LLM_TIEBREAK
 from src.models import (
     TaskList,
     DependencyList,
     Schedule,
     TaskSchedule,
-    TaskAllocation,
     TaskAllocationList,
     Risk,
     RiskList,
+    PlanCandidate,
+    FlexibleString,
+    WorkCalendar,
 )
 from src.state import AgentState
+from src.leveling import level_resources, find_overallocations
+from src.work_calendar import assign_dates, member_days_off, resolve_start_date
+from src.allocation import (
+    skill_score_matrix,
+    tied_tasks,
+    solve_assignment,
+    resolve_member_name,
+)
 
 
 # --- Helper: Universal Data Wrapper ---
@@ -82,38 +93,46 @@ def dependency_mapping_node(state: AgentState):
 
 
 # --- 3. Scheduler ---
-def smart_scheduler_node(state: AgentState):
-    print("--- Node: Scheduler ---")
+class SimpleSchedItem(BaseModel):
+    task_id: str = Field(..., validation_alias=AliasChoices("task_id", "id", "task_name"))
+    start: SafeInt = Field(..., validation_alias=AliasChoices("start", "start_day"))
+    end: SafeInt = Field(..., validation_alias=AliasChoices("end", "end_day"))
+
+
+class SimpleSched(BaseModel):
+    items: List[SimpleSchedItem]
+
+    @model_validator(mode="before")
+    @classmethod
+    def wrap(cls, data):
+        target = data
+        if isinstance(data, dict):
+            for key in ["tasks", "schedule", "items", "timeline", "task_schedules"]:
+                if key in data:
+                    target = data[key]
+                    break
+        if isinstance(target, dict):
+            return {"items": standardize_to_list(target, key_alias="task_id")}
+        if isinstance(target, list):
+            return {"items": target}
+        return data
+
 
+def schedule_prompt(state: AgentState) -> str:
     insights = state.get("insights", [])
     latest_insight = insights[-1] if insights else "None"
 
-    class SimpleSchedItem(BaseModel):
-        task_id: str = Field(..., validation_alias=AliasChoices("task_id", "id", "task_name"))
-        start: SafeInt = Field(..., validation_alias=AliasChoices("start", "start_day"))
-        end: SafeInt = Field(..., validation_alias=AliasChoices("end", "end_day"))
-
-    class SimpleSched(BaseModel):
-        items: List[SimpleSchedItem]
-
-        @model_validator(mode="before")
-        @classmethod
-        def wrap(cls, data):
-            target = data
-            if isinstance(data, dict):
-                for key in ["tasks", "schedule", "items", "timeline", "task_schedules"]:
-                    if key in data:
-                        target = data[key]
-                        break
-            if isinstance(target, dict):
-                return {"items": standardize_to_list(target, key_alias="task_id")}
-            if isinstance(target, list):
-                return {"items": target}
-            return data
+    # On optimizer rounds, revise the plan the insight was written against
+    current = ""
+    if state.get("schedule"):
+        current = "\n    Current schedule (task_id: start-end), revise it:\n    " + ", ".join(
+            f"{s.task.id}: {s.start_day}-{s.end_day}" for s in state["schedule"].schedule
+        )
 
-    prompt = f"""
+    return f"""
     Schedule tasks: {state['tasks']}
     Dependencies: {state.get('dependencies')}
+    {current}
 
     Previous optimization insight (MUST apply if not None):
     {latest_insight}
@@ -124,8 +143,12 @@ def smart_scheduler_node(state: AgentState):
     3. DO NOT return null. Start day must be an integer (0, 1, 2...).
     """
 
+
+def smart_scheduler_node(state: AgentState):
+    print("--- Node: Scheduler ---")
+
     struct_llm = llm.with_structured_output(SimpleSched, method="json_mode")
-    resp = struct_llm.invoke(prompt)
+    resp = struct_llm.invoke(schedule_prompt(state))
 
     task_map = {t.id: t for t in state["tasks"].task}
     task_map.update({t.task_name: t for t in state["tasks"].task})
@@ -215,24 +238,68 @@ def resource_allocation_node(state: AgentState):
                 return {"allocs": target}
             return data
 
-    prompt = f"Allocate tasks: {state['tasks']} to Team: {state['team']}. IMPORTANT: Return JSON."
-    struct_llm = llm.with_structured_output(SimpleAlloc, method="json_mode")
-    resp = struct_llm.invoke(prompt)
+    tasks = state["tasks"].task
+    members = state["team"].team_members
+    scores = skill_score_matrix(tasks, members)
 
-    task_map = {t.id: t for t in state["tasks"].task}
-    task_map.update({t.task_name: t for t in state["tasks"].task})
-    member_map = {m.name: m for m in state["team"].team_members}
+    # Previous allocations (earlier round, beam parent) are kept where skill
+    # fit allows, so a re-plan doesn't reshuffle the team for nothing
+    previous = state.get("task_allocations")
+    preferences = (
+        {a.task.id: a.team_member.name for a in previous.task_allocations} if previous else {}
+    )
 
-    final_allocs = []
-    for a in resp.allocs:
-        task = task_map.get(str(a.task_id))
-        member = member_map.get(a.member_name)
-        if task and member:
-            final_allocs.append(TaskAllocation(task=task, team_member=member))
+    # The LLM is only consulted to break exact ties; the solver makes the final call
+    tied = tied_tasks(tasks, scores) if ALLOCATOR_LLM_TIEBREAK else []
+    if tied:
+        prompt = f"Allocate tasks: {TaskList(task=tied)} to Team: {state['team']}. IMPORTANT: Return JSON."
+        struct_llm = llm.with_structured_output(SimpleAlloc, method="json_mode")
+        resp = struct_llm.invoke(prompt)
+
+        task_map = {t.id: t for t in tied}
+        task_map.update({t.task_name: t for t in tied})
+        for a in resp.allocs:
+            task = task_map.get(str(a.task_id))
+            member = resolve_member_name(a.member_name, members)
+            if task and member:
+                preferences[task.id] = member.name
+
+    final_allocs = solve_assignment(
+        tasks, members, preferences=preferences, scores=scores
+    )
+    print(f"Allocated {len(final_allocs)} tasks ({len(tied)} LLM tie-breaks).")
 
     return {"task_allocations": TaskAllocationList(task_allocations=final_allocs)}
 
 
+# --- 4b. Leveler ---
+def resource_leveling_node(state: AgentState):
+    print("--- Node: Leveler ---")
+    conflicts = find_overallocations(
+        state["schedule"], state["task_allocations"], state["team"]
+    )
+    print(f"Found {len(conflicts)} over-allocated period(s).")
+
+    calendar = state.get("calendar") or WorkCalendar()
+    start = state.get("start_date") or resolve_start_date(calendar)
+    days_off = member_days_off(calendar, start)
+
+    schedule, allocations = state["schedule"], state["task_allocations"]
+    if conflicts or days_off:
+        schedule, allocations = level_resources(
+            state["tasks"],
+            state.get("dependencies", []),
+            schedule,
+            allocations,
+            state["team"],
+            days_off=days_off,
+        )
+
+    # Pin day offsets to real working dates for the auditor and the report
+    schedule = assign_dates(schedule, calendar, start)
+    return {"schedule": schedule, "task_allocations": allocations, "start_date": start}
+
+
 # --- 5. Auditor ---
 def risk_audit_node(state: AgentState):
     print("--- Node: Auditor ---")
@@ -309,3 +376,110 @@ def optimization_insight_node(state: AgentState):
     prompt = f"Risks: {state['risks']}. Suggest 1 concrete change to lower risk."
     insight = llm.invoke(prompt).content
     return {"insights": state.get("insights", []) + [insight]}
+
+
+# --- 7. Beam Optimizer ---
+def propose_insights(risks: RiskList, k: int) -> List[str]:
+    """Ask the LLM for k alternative changes in a single call."""
+
+    class InsightList(BaseModel):
+        insights: List[FlexibleString]
+
+        @model_validator(mode="before")
+        @classmethod
+        def wrap(cls, data):
+            target = data
+            if isinstance(data, dict):
+                for key in ["insights", "changes", "suggestions", "items"]:
+                    if key in data:
+                        target = data[key]
+                        break
+            if isinstance(target, list):
+                return {"insights": target}
+            return data
+
+    prompt = f"""
+    Risks: {risks}
+    Suggest {k} DIFFERENT concrete changes to lower risk.
+    Each change must be an independent alternative, not a step of the same change.
+    Return JSON: {{"insights": ["change 1", "change 2", ...]}}
+    """
+    struct_llm = llm.with_structured_output(InsightList, method="json_mode")
+    resp = struct_llm.invoke(prompt)
+    return resp.insights[:k]
+
+
+def evaluate_candidate(
+    state: AgentState, parent: PlanCandidate, insight: str
+) -> PlanCandidate:
+    """
+    Apply one insight to a surviving plan: scheduler -> allocator -> leveler ->
+    auditor on a private state copy. The scheduler revises the parent's
+    schedule and the allocator prefers the parent's assignees.
+    """
+    insights = parent.insights + [insight]
+    branch = {
+        **state,
+        "schedule": parent.schedule,
+        "task_allocations": parent.task_allocations,
+        "insights": insights,
+        "iteration_number": 0,
+        "project_risk_score_iterations": [],
+    }
+    branch.update(smart_scheduler_node(branch))
+    branch.update(resource_allocation_node(branch))
+    branch.update(resource_leveling_node(branch))
+    audit = risk_audit_node(branch)
+    return PlanCandidate(
+        insights=insights,
+        schedule=branch["schedule"],
+        task_allocations=branch["task_allocations"],
+        risks=audit["risks"],
+        score=audit["project_risk_score_iterations"][-1],
+    )
+
+
+def beam_optimizer_node(state: AgentState):
+    print("--- Node: Beam Optimizer ---")
+    width = max(1, state.get("beam_width", 1))
+    scores = state.get("project_risk_score_iterations", [])
+
+    # Seed the beam with the plan the auditor just scored
+    beam = state.get("beam") or [
+        PlanCandidate(
+            insights=state.get("insights", []),
+            schedule=state["schedule"],
+            task_allocations=state["task_allocations"],
+            risks=state["risks"],
+            score=scores[-1] if scores else 999,
+        )
+    ]
+
+    with ThreadPoolExecutor(max_workers=min(BEAM_MAX_WORKERS, len(beam) * width)) as pool:
+        proposals = list(pool.map(lambda p: propose_insights(p.risks, width), beam))
+        branches = [
+            (plan, insight)
+            for plan, insights in zip(beam, proposals)
+            for insight in insights
+        ]
+        evaluated = list(
+            pool.map(lambda b: evaluate_candidate(state, *b), branches)
+        )
+
+    # Parents stay eligible so a round of bad proposals never makes the plan worse
+    survivors = sorted(beam + evaluated, key=lambda p: p.score)[:width]
+    best = survivors[0]
+    print(
+        f"Evaluated {len(evaluated)} candidates; "
+        f"beam scores: {[p.score for p in survivors]}"
+    )
+
+    return {
+        "beam": survivors,
+        "insights": best.insights,
+        "schedule": best.schedule,
+        "task_allocations": best.task_allocations,
+        "risks": best.risks,
+        "project_risk_score_iterations": scores + [best.score],
+        "iteration_number": state.get("iteration_number", 0) + 1,
+    }
@@ -0,0 +1,288 @@
+import os
+import uuid
+from typing import Dict, List, Optional, Set
+
+from src.config import llm
+from src.models import (
+    Task,
+    TaskList,
+    Team,
+    Dependency,
+    DependencyList,
+    Schedule,
+    TaskSchedule,
+    TaskAllocation,
+    TaskAllocationList,
+    PlanDiff,
+    PlanSnapshot,
+    WorkCalendar,
+)
+from src.leveling import (
+    build_task_map,
+    resolve_task_key,
+    predecessor_map,
+    successor_map,
+    topological_order,
+    level_resources,
+)
+from src.allocation import solve_assignment
+from src.work_calendar import assign_dates, member_days_off, resolve_start_date
+from src.nodes import risk_audit_node
+from src.state import AgentState
+
+RUNS_DIR = os.path.join("outputs", "runs")
+
+
+# --- Run Store ---
+def run_path(thread_id: str) -> str:
+    return os.path.join(RUNS_DIR, f"{thread_id}.json")
+
+
+def save_run(state: AgentState, thread_id: str) -> str:
+    snapshot = PlanSnapshot.model_validate(
+        {k: v for k, v in state.items() if k in PlanSnapshot.model_fields}
+    )
+    os.makedirs(RUNS_DIR, exist_ok=True)
+    path = run_path(thread_id)
+    with open(path, "w") as f:
+        f.write(snapshot.model_dump_json(indent=2))
+    return path
+
+
+def load_run(thread_id: str) -> AgentState:
+    path = run_path(thread_id)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No saved run for thread_id '{thread_id}' ({path})")
+    with open(path) as f:
+        snapshot = PlanSnapshot.model_validate_json(f.read())
+    return dict(snapshot)
+
+
+# --- Delta LLM Calls ---
+def scope_amendment(state: AgentState, amendment: str) -> List[Task]:
+    """Scope only the work the amendment adds, not the whole brief again."""
+    existing = "\n".join(f"- {t.task_name}" for t in state["tasks"].task)
+    prompt = f"""
+    Project: {state['project_description']}
+    Existing tasks:
+    {existing}
+
+    Brief amendment: {amendment}
+
+    Return ONLY the NEW tasks this amendment requires (do not repeat existing tasks).
+    No task should exceed 3 days.
+    REQUIRED JSON FIELDS: 'task_name', 'task_description', 'estimated_day', 'required_skill'.
+    """
+    struct_llm = llm.with_structured_output(TaskList, method="json_mode")
+    return struct_llm.invoke(prompt).task
+
+
+def map_new_dependencies(tasks: TaskList, new_ids: Set[str]) -> List[Dependency]:
+    """Ask the mapper only for edges that touch the new tasks."""
+    new_fmt = "\n".join(
+        f"ID: {t.id} | Name: {t.task_name}" for t in tasks.task if t.id in new_ids
+    )
+    all_fmt = "\n".join(f"ID: {t.id} | Name: {t.task_name}" for t in tasks.task)
+    prompt = (
+        f"Existing plan tasks:\n{all_fmt}\n\nNewly added tasks:\n{new_fmt}\n"
+        "Map dependencies that involve the newly added tasks only. "
+        "Return JSON matching DependencyList. Use IDs."
+    )
+    struct_llm = llm.with_structured_output(DependencyList, method="json_mode")
+    task_map = build_task_map(tasks)
+    # The mapper sees the whole plan and may echo old edges: keep only new ones
+    found = []
+    for d in canonical_edges(struct_llm.invoke(prompt).dependencies, task_map):
+        kept = [p for p in d.dependent_on if d.task_id in new_ids or p in new_ids]
+        if kept:
+            found.append(Dependency(task_id=d.task_id, dependent_on=kept))
+    return found
+
+
+# --- Helpers ---
+def canonical_edges(
+    deps: List[Dependency], task_map: Dict[str, Task], seen: Optional[Set[tuple]] = None
+) -> List[Dependency]:
+    """
+    Edges keyed by task id. Ends that don't resolve and edges already in
+    `seen` (task, predecessor) are dropped; `seen` is updated in place.
+    """
+    seen = set() if seen is None else seen
+    out = []
+    for d in deps:
+        t_id = resolve_task_key(task_map, d.task_id)
+        if t_id is None:
+            continue
+        kept = []
+        for x in d.dependent_on:
+            p_id = resolve_task_key(task_map, x)
+            if p_id and p_id != t_id and (t_id, p_id) not in seen:
+                seen.add((t_id, p_id))
+                kept.append(p_id)
+        if kept:
+            out.append(Dependency(task_id=t_id, dependent_on=kept))
+    return out
+
+
+def descendants(roots: Set[str], succs: Dict[str, List[str]]) -> Set[str]:
+    cone, stack = set(roots), list(roots)
+    while stack:
+        for s in succs.get(stack.pop(), []):
+            if s not in cone:
+                cone.add(s)
+                stack.append(s)
+    return cone
+
+
+# --- Incremental Re-plan ---
+def apply_diff(state: AgentState, diff: PlanDiff, audit: bool = True) -> AgentState:
+    """
+    Apply a diff to a finished plan and recompute only what it invalidates:
+    dependencies touching new tasks, the schedule cone below changed tasks
+    and allocations of changed or orphaned tasks. The leveler and one audit
+    call then run on the merged plan.
+    """
+    state = dict(state)
+    old_sched = {item.task.id: item for item in state["schedule"].schedule}
+    old_alloc = {a.task.id: a.team_member for a in state["task_allocations"].task_allocations}
+    dirty_sched, dirty_alloc = set(), set()
+
+    # 1) Brief: amend the description and scope only the delta
+    add_tasks = list(diff.add_tasks)
+    if diff.brief_amendment:
+        add_tasks += scope_amendment(state, diff.brief_amendment)
+        state["project_description"] += f"\nAmendment: {diff.brief_amendment}"
+
+    # 2) Team
+    removed_members = set(diff.remove_members)
+    members = [m for m in state["team"].team_members if m.name not in removed_members]
+    members += diff.add_members
+    state["team"] = Team(team_members=members)
+    dirty_alloc.update(t for t, m in old_alloc.items() if m.name in removed_members)
+
+    # 3) Tasks
+    task_map = build_task_map(state["tasks"])
+    # Pin edges to ids before edits: edges keyed by a task's old name must
+    # survive a rename
+    old_deps = canonical_edges(state.get("dependencies", []), task_map)
+    removed = {task_map[k].id for k in diff.remove_tasks if k in task_map}
+    tasks = {t.id: t for t in state["tasks"].task if t.id not in removed}
+    for edit in diff.edit_tasks:
+        task = tasks.get(task_map[edit.id].id) if edit.id in task_map else None
+        if task is None:
+            print(f"[WARN] Edit for unknown task '{edit.id}' ignored.")
+            continue
+        changes = edit.model_dump(exclude={"id"}, exclude_none=True)
+        tasks[task.id] = task.model_copy(update=changes)
+        if "estimated_day" in changes:
+            dirty_sched.add(task.id)
+        if "required_skill" in changes:
+            dirty_alloc.add(task.id)
+
+    # New ids must not collide with any task of the old plan, removed ones
+    # included, or they would inherit its dates and allocation
+    used_ids = {t.id for t in state["tasks"].task} | set(old_sched) | set(old_alloc)
+    new_ids, renamed = set(), {}
+    for t in add_tasks:
+        requested = t.id
+        while not t.id or t.id in used_ids:
+            t.id = str(uuid.uuid4())[:4]
+        if requested and requested != t.id:
+            renamed[requested] = t.id
+        used_ids.add(t.id)
+        tasks[t.id] = t
+        new_ids.add(t.id)
+    state["tasks"] = TaskList(task=list(tasks.values()))
+    dirty_sched |= new_ids
+    dirty_alloc |= new_ids
+
+    # 4) Dependencies: drop edges to removed tasks, add edges for new ones
+    task_map = build_task_map(state["tasks"])
+    # Edges in the diff refer to new tasks by the id the user gave them
+    added_deps = [
+        Dependency(
+            task_id=renamed.get(str(d.task_id), d.task_id),
+            dependent_on=[renamed.get(str(x), x) for x in d.dependent_on],
+        )
+        for d in diff.add_dependencies
+    ]
+    seen = set()
+    deps = canonical_edges(old_deps + added_deps, task_map, seen)
+    explicit = set()
+    for d in added_deps:
+        task = task_map.get(str(d.task_id))
+        if task is None:
+            print(f"[WARN] Dependency for unknown task '{d.task_id}' ignored.")
+            continue
+        explicit.add(task.id)
+    if new_ids - explicit:
+        mapped = map_new_dependencies(state["tasks"], new_ids - explicit)
+        deps += canonical_edges(mapped, task_map, seen)
+    state["dependencies"] = deps
+
+    # 5) Schedule cone: changed tasks and everything downstream of them.
+    #    Tasks outside the cone keep their dates; unscheduled ones get placed.
+    preds = predecessor_map(task_map, deps)
+    order = [t.id for t in state["tasks"].task]
+    cone = descendants(dirty_sched, successor_map(preds))
+    start, end = {}, {}
+    for t_id in topological_order(order, preds, key=lambda t: 0):
+        old = old_sched.get(t_id)
+        if t_id not in cone and old:
+            start[t_id], end[t_id] = old.start_day, old.end_day
+            continue
+        ready = max([end[p] for p in preds[t_id] if p in end], default=0)
+        s = max(ready, old.start_day if old else 0)
+        if t_id in dirty_sched or not old:
+            duration = tasks[t_id].estimated_day
+        else:
+            duration = old.end_day - old.start_day
+        start[t_id], end[t_id] = s, s + max(1, duration)
+    state["schedule"] = Schedule(
+        schedule=[
+            TaskSchedule(task=tasks[t], start_day=start[t], end_day=end[t])
+            for t in order
+        ]
+    )
+
+    # 6) Allocations: keep untouched ones, re-assign only invalidated tasks
+    allocs = {t: m for t, m in old_alloc.items() if t in tasks and t not in dirty_alloc}
+    load = {}
+    for t_id, m in allocs.items():
+        load[m.name] = load.get(m.name, 0) + end[t_id] - start[t_id]
+    pending = [tasks[t] for t in order if t not in allocs]
+    for a in solve_assignment(pending, members, load=load):
+        allocs[a.task.id] = a.team_member
+    state["task_allocations"] = TaskAllocationList(
+        task_allocations=[
+            TaskAllocation(task=tasks[t], team_member=allocs[t]) for t in order if t in allocs
+        ]
+    )
+
+    print(
+        f"Re-plan: {len(new_ids)} added, {len(removed)} removed, "
+        f"{len(cone)} rescheduled, {len(dirty_alloc)} re-allocated."
+    )
+
+    # 7) Level and date the merged plan, then one audit call for the new risk score
+    calendar = state.get("calendar") or WorkCalendar()
+    # Runs saved before start dates were persisted get pinned on first re-plan
+    state["start_date"] = state.get("start_date") or resolve_start_date(calendar)
+    state["schedule"], state["task_allocations"] = level_resources(
+        state["tasks"],
+        deps,
+        state["schedule"],
+        state["task_allocations"],
+        state["team"],
+        days_off=member_days_off(calendar, state["start_date"]),
+    )
+    state["schedule"] = assign_dates(state["schedule"], calendar, state["start_date"])
+    if audit:
+        state.update(risk_audit_node(state))
+    return state
+
+
+def replan_run(thread_id: str, diff: PlanDiff, audit: bool = True) -> AgentState:
+    state = apply_diff(load_run(thread_id), diff, audit=audit)
+    save_run(state, thread_id)
+    return state
@@ -1,5 +1,15 @@
+from datetime import date
 from typing import TypedDict, List
-from src.models import Team, TaskList, Schedule, TaskAllocationList, RiskList, Dependency
+from src.models import (
+    Team,
+    TaskList,
+    Schedule,
+    TaskAllocationList,
+    RiskList,
+    Dependency,
+    PlanCandidate,
+    WorkCalendar,
+)
 
 
 class AgentState(TypedDict):
@@ -14,3 +24,7 @@ class AgentState(TypedDict):
     max_iteration: int
     insights: List[str]
     project_risk_score_iterations: List[int]
+    beam_width: int
+    beam: List[PlanCandidate]
+    calendar: WorkCalendar
+    start_date: date
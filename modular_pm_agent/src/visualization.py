@@ -1,8 +1,11 @@
 import os
 import re
+import numpy as np
 import pandas as pd
 import plotly.express as px
-from datetime import datetime, timedelta
+
+from src.models import WorkCalendar
+from src.work_calendar import working_dates, resolve_start_date
 
 
 def visualize_results(final_state):
@@ -18,9 +21,6 @@ def visualize_results(final_state):
         print(f"└── {m.name} ({m.role})")
 
     # --- Prepare Data ---
-    sched_data = []
-    start_date_base = datetime.now().replace(hour=8, minute=0, second=0, microsecond=0)
-
     # Lookup maps
     sched_map = {item.task.task_name: item for item in final_state["schedule"].schedule}
     alloc_map = {
@@ -29,37 +29,57 @@ def visualize_results(final_state):
     }
 
     # Iterate through ALL tasks (master list)
-    for task in final_state["tasks"].task:
+    tasks = final_state["tasks"].task
+    if not tasks:
+        print("\n[ERROR] No tasks found to plot.")
+        return
+
+    start_days, end_days, assignees, stored = [], [], [], []
+    for task in tasks:
         t_name = task.task_name
-        assignee = alloc_map.get(t_name, "Unassigned")
+        member = alloc_map.get(t_name)
+        assignee = member or "Unassigned"
 
         if t_name in sched_map:
             item = sched_map[t_name]
             start_day = max(0, item.start_day)
             end_day = max(start_day + 1, item.end_day)  # Ensure end > start
+            if item.start_date and item.end_date:
+                stored.append((item.start_date, item.end_date))
+            else:
+                stored.append(None)
         else:
             start_day = 0
             end_day = 1
             assignee = f"{assignee} (Unscheduled)"
-
-        s_date = start_date_base + timedelta(days=start_day)
-        duration = max(1, end_day - start_day)
-        e_date = s_date + timedelta(days=duration)
-
-        sched_data.append(
-            {
-                "Task": t_name,
-                "Start": s_date.strftime("%Y-%m-%d"),
-                "Finish": e_date.strftime("%Y-%m-%d"),
-                "Assignee": assignee,
-                "Duration (Days)": duration,
-                "Description": (task.task_description or "")[:60] + "...",
-            }
+            stored.append(None)
+
+        start_days.append(start_day)
+        end_days.append(end_day)
+        assignees.append(assignee)
+
+    # Dates pinned by the leveler are the source of truth; only tasks without
+    # them (unscheduled, or states saved before dating) are converted here
+    start_dates = np.array([d[0] if d else None for d in stored], dtype="datetime64[D]")
+    last_dates = np.array([d[1] if d else None for d in stored], dtype="datetime64[D]")
+    missing = [i for i, d in enumerate(stored) if d is None]
+    if missing:
+        calendar = final_state.get("calendar") or WorkCalendar()
+        start_dates[missing], last_dates[missing] = working_dates(
+            [start_days[i] for i in missing],
+            [end_days[i] for i in missing],
+            calendar,
+            final_state.get("start_date") or resolve_start_date(calendar),
         )
-
-    if not sched_data:
-        print("\n[ERROR] No tasks found to plot.")
-        return
+    sched_data = {
+        "Task": [t.task_name for t in tasks],
+        "Start": np.datetime_as_string(start_dates),
+        # Bars end at the close of the last working day
+        "Finish": np.datetime_as_string(last_dates + np.timedelta64(1, "D")),
+        "Assignee": assignees,
+        "Duration (Days)": np.subtract(end_days, start_days),
+        "Description": [(t.task_description or "")[:60] + "..." for t in tasks],
+    }
 
     df = pd.DataFrame(sched_data).sort_values("Start")
     if df.empty:
@@ -0,0 +1,82 @@
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models import Schedule, WorkCalendar
+
+
+# --- Calendars ---
+def busday_calendar(calendar: WorkCalendar) -> np.busdaycalendar:
+    """numpy business-day calendar shared by the whole team."""
+    return np.busdaycalendar(
+        weekmask=calendar.weekmask,
+        holidays=np.array(calendar.holidays, dtype="datetime64[D]"),
+    )
+
+
+def resolve_start_date(calendar: WorkCalendar, start: Optional[date] = None) -> date:
+    """
+    First working day on or after `start` (today by default). Resolve this once
+    per run and keep it in the state, so re-renders and re-plans don't move
+    every date to the day they happen to run.
+    """
+    base = np.datetime64(start or date.today(), "D")
+    first = np.busday_offset(base, 0, roll="forward", busdaycal=busday_calendar(calendar))
+    return first.astype(object)
+
+
+# --- Member Availability ---
+def member_days_off(calendar: WorkCalendar, start: date) -> Dict[str, List[int]]:
+    """
+    Per-member days off as working-day offsets on the team timeline, ready to be
+    blocked on the member's leveling timeline. Days off that are not team
+    working days (weekends, holidays) are already excluded from the offsets.
+    """
+    cal = busday_calendar(calendar)
+    origin = np.datetime64(start, "D")
+    blocked = {}
+    for name, days in calendar.member_unavailable.items():
+        d = np.array(days, dtype="datetime64[D]")
+        d = d[(d >= origin) & np.is_busday(d, busdaycal=cal)]
+        if len(d):
+            blocked[name] = np.busday_count(origin, d, busdaycal=cal).tolist()
+    return blocked
+
+
+# --- Offset -> Date Conversion ---
+def working_dates(
+    start_days: Sequence[int],
+    end_days: Sequence[int],
+    calendar: WorkCalendar,
+    start: date,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert working-day offsets into dates in one vectorized busday_offset call.
+    `start_day` is the 0-based working day a task begins; `end_day` is
+    exclusive, so the last working day is `end_day - 1`. All members share the
+    team calendar, so dependency order between offsets is kept in the dates;
+    member days off are handled by the leveler instead.
+    """
+    starts = np.asarray(start_days, dtype=np.int64)
+    lasts = np.maximum(np.asarray(end_days, dtype=np.int64) - 1, starts)
+    cal = busday_calendar(calendar)
+    origin = np.datetime64(start, "D")
+    return (
+        np.busday_offset(origin, starts, roll="forward", busdaycal=cal),
+        np.busday_offset(origin, lasts, roll="forward", busdaycal=cal),
+    )
+
+
+def assign_dates(schedule: Schedule, calendar: WorkCalendar, start: date) -> Schedule:
+    """Return the schedule with start_date / end_date filled from the calendar."""
+    items = schedule.schedule
+    start_dates, last_dates = working_dates(
+        [i.start_day for i in items], [i.end_day for i in items], calendar, start
+    )
+    return Schedule(
+        schedule=[
+            item.model_copy(update={"start_date": s, "end_date": e})
+            for item, s, e in zip(items, start_dates.tolist(), last_dates.tolist())
+        ]
+    )
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Tests import the app the same way main.py does: `from src...`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# src.config builds the Groq client at import; tests stub every LLM call
+os.environ.setdefault("GROQ_API_KEY", "test")
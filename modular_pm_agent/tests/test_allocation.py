@@ -0,0 +1,52 @@
+from collections import Counter
+
+from src.allocation import solve_assignment, resolve_member_name
+from src.models import Task, TeamMember
+
+TEAM = [
+    TeamMember(name="Alice", role="Lead Dev", skills=["Python", "LangGraph"], seniority="Senior"),
+    TeamMember(name="Bob", role="Frontend", skills=["React", "UI/UX"], seniority="Mid"),
+    TeamMember(name="Charlie", role="QA", skills=["Testing", "Python"], seniority="Junior"),
+]
+
+
+def make_tasks(skills):
+    return [
+        Task(id=str(i), task_name=f"T{i}", estimated_day=2, required_skill=s)
+        for i, s in enumerate(skills)
+    ]
+
+
+def test_scarce_skill_stays_with_the_only_skilled_member():
+    tasks = make_tasks(["React"] * 8 + ["Python"] * 4)
+    allocs = solve_assignment(tasks, TEAM)
+    owners = {a.task.id: a.team_member.name for a in allocs}
+    assert all(owners[str(i)] == "Bob" for i in range(8))
+    # Equally skilled members share the Python work
+    assert Counter(owners[str(i)] for i in range(8, 12)) == {"Alice": 2, "Charlie": 2}
+
+
+def test_assignment_is_deterministic():
+    tasks = make_tasks(["Python", "React", "General", "Testing"] * 5)
+    first = [(a.task.id, a.team_member.name) for a in solve_assignment(tasks, TEAM)]
+    second = [(a.task.id, a.team_member.name) for a in solve_assignment(tasks, TEAM)]
+    assert first == second and len(first) == len(tasks)
+
+
+def test_member_names_resolve_despite_typos():
+    assert resolve_member_name("alice ", TEAM).name == "Alice"
+    assert resolve_member_name("Charile", TEAM).name == "Charlie"
+    assert resolve_member_name("Zed", TEAM) is None
+
+
+def test_load_is_balanced_by_days_not_task_count():
+    # Alice already carries 6 days; counting tasks alone leaves her 8 vs 10
+    team = [TEAM[0], TEAM[2]]
+    tasks = [
+        Task(id=str(i), task_name=f"T{i}", estimated_day=d, required_skill="Python")
+        for i, d in enumerate([3, 3, 3, 1, 1, 1])
+    ]
+    days = Counter({"Alice": 6})
+    for a in solve_assignment(tasks, team, load={"Alice": 6}):
+        days[a.team_member.name] += a.task.estimated_day
+    assert days == {"Alice": 9, "Charlie": 9}
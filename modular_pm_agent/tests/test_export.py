@@ -0,0 +1,18 @@
+from src.export import plan_rows
+from src.models import Task, TaskList, Dependency
+
+
+def test_dependency_rows_use_task_ids_and_drop_dangling_edges():
+    tasks = TaskList(
+        task=[
+            Task(id="a", task_name="Design", estimated_day=1, required_skill="UX"),
+            Task(id="b", task_name="Build", estimated_day=2, required_skill="Python"),
+        ]
+    )
+    deps = [
+        Dependency(task_id="Build", dependent_on=["Design", "zz"]),
+        Dependency(task_id="b", dependent_on=["a"]),
+        Dependency(task_id="gone", dependent_on=["a"]),
+    ]
+    rows = plan_rows({"tasks": tasks, "dependencies": deps}, run_id="r1")
+    assert [(r["task_id"], r["depends_on"]) for r in rows["dependencies"]] == [("b", "a")]
@@ -0,0 +1,108 @@
+import random
+import time
+
+from src.leveling import MemberTimeline, level_resources, find_overallocations
+from src.models import (
+    Task,
+    TaskList,
+    Team,
+    TeamMember,
+    Dependency,
+    Schedule,
+    TaskSchedule,
+    TaskAllocation,
+    TaskAllocationList,
+)
+
+ALICE = TeamMember(name="Alice", role="Dev", skills=["Python"], seniority="Senior")
+BOB = TeamMember(name="Bob", role="Frontend", skills=["React"], seniority="Mid")
+
+
+def make_task(task_id, days, skill="Python"):
+    return Task(id=task_id, task_name=task_id.upper(), estimated_day=days, required_skill=skill)
+
+
+def level(tasks, spans, owners, deps=(), team=(ALICE, BOB)):
+    task_map = {t.id: t for t in tasks}
+    schedule = Schedule(
+        schedule=[
+            TaskSchedule(task=task_map[t], start_day=s, end_day=e)
+            for t, (s, e) in spans.items()
+        ]
+    )
+    allocations = TaskAllocationList(
+        task_allocations=[
+            TaskAllocation(task=task_map[t], team_member=m) for t, m in owners.items()
+        ]
+    )
+    team = Team(team_members=list(team))
+    leveled, allocs = level_resources(
+        TaskList(task=tasks), list(deps), schedule, allocations, team
+    )
+    assert find_overallocations(leveled, allocs, team) == []
+    return {i.task.id: (i.start_day, i.end_day) for i in leveled.schedule}, allocs
+
+
+def test_unscheduled_task_does_not_book_capacity():
+    tasks = [make_task("a", 5), make_task("b", 2), make_task("c", 2)]
+    spans, allocs = level(
+        tasks,
+        spans={"b": (0, 2), "c": (2, 4)},
+        owners={"a": ALICE, "b": ALICE, "c": ALICE},
+        deps=[Dependency(task_id="b", dependent_on=["a"])],
+    )
+    assert spans == {"b": (0, 2), "c": (2, 4)}
+    # Its allocation is kept even though it has no dates
+    assert {a.task.id for a in allocs.task_allocations} == {"a", "b", "c"}
+
+
+def test_critical_task_keeps_slot_over_earlier_slack_task():
+    # y -> z is the critical path (ends day 11); x can slide until day 9
+    tasks = [make_task("x", 2), make_task("y", 4), make_task("z", 6, skill="React")]
+    spans, _ = level(
+        tasks,
+        spans={"x": (0, 2), "y": (1, 5), "z": (5, 11)},
+        owners={"x": ALICE, "y": ALICE, "z": BOB},
+        deps=[Dependency(task_id="z", dependent_on=["y"])],
+        team=(ALICE, BOB),
+    )
+    assert spans["y"] == (1, 5)
+    assert spans["z"] == (5, 11)
+    assert spans["x"][0] >= 5 and spans["x"][1] <= 11
+
+
+def test_touching_bookings_merge_into_one_block():
+    timeline = MemberTimeline()
+    for start in (4, 0, 2, 6):
+        timeline.book(start, start + 2, 0)
+    assert timeline.lanes[0] == ([0], [8])
+    assert timeline.earliest_slot(1, 2) == (8, 0)
+
+
+def test_large_plan_levels_interactively():
+    # 10k tasks on 50 members: each member ends up with a long packed timeline
+    rng = random.Random(0)
+    skills = ["Python", "React", "SQL", "DevOps", "UX"]
+    team = [
+        TeamMember(name=f"m{j}", role="Dev", skills=rng.sample(skills, 2), seniority="Mid")
+        for j in range(50)
+    ]
+    tasks = [make_task(f"t{i}", rng.randint(1, 3), rng.choice(skills)) for i in range(10_000)]
+    deps, spans = [], {}
+    for i, t in enumerate(tasks):
+        ps = rng.sample(range(max(0, i - 50), i), min(i, rng.randint(0, 2)))
+        if ps:
+            deps.append(Dependency(task_id=t.id, dependent_on=[f"t{p}" for p in ps]))
+        s = max([spans[f"t{p}"][1] for p in ps], default=0)
+        spans[t.id] = (s, s + t.estimated_day)
+    owners = {
+        t.id: rng.choice([m for m in team if t.required_skill in m.skills] or team)
+        for t in tasks
+    }
+
+    began = time.perf_counter()
+    leveled, _ = level(tasks, spans, owners, deps=deps, team=team)
+    assert time.perf_counter() - began < 3
+    for d in deps:
+        for p in d.dependent_on:
+            assert leveled[d.task_id][0] >= leveled[p][1]
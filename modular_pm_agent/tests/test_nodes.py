@@ -0,0 +1,131 @@
+import re
+from datetime import date
+
+import pytest
+
+import src.nodes as nodes
+from src.models import (
+    Task,
+    TaskList,
+    Team,
+    TeamMember,
+    Schedule,
+    TaskSchedule,
+    TaskAllocation,
+    TaskAllocationList,
+    RiskList,
+    Risk,
+    PlanCandidate,
+    WorkCalendar,
+)
+
+ALICE = TeamMember(name="Alice", role="Dev", skills=["Python"], seniority="Senior")
+BOB = TeamMember(name="Bob", role="Frontend", skills=["React"], seniority="Mid")
+CAROL = TeamMember(name="Carol", role="Dev", skills=["Python"], seniority="Mid")
+A = Task(id="a", task_name="A", estimated_day=1, required_skill="Python")
+B = Task(id="b", task_name="B", estimated_day=1, required_skill="React")
+
+
+class StubLLM:
+    """
+    Insights are "stretch N"; the scheduler makes every task N days long and
+    the auditor scores a plan by its makespan.
+    """
+
+    def __init__(self, proposals):
+        self.proposals = proposals
+        self.schema = None
+
+    def with_structured_output(self, schema, **kwargs):
+        stub = StubLLM(self.proposals)
+        stub.schema = schema
+        return stub
+
+    def invoke(self, prompt):
+        name = self.schema.__name__
+        if name == "InsightList":
+            data = {"insights": self.proposals}
+        elif name == "SimpleSched":
+            n = int(re.search(r"stretch (\d+)", prompt).group(1))
+            data = {"schedule": [{"task_id": t, "start": 0, "end": n} for t in ("a", "b")]}
+        else:
+            makespan = max(int(d) for d in re.findall(r"end_day=(\d+)", prompt))
+            data = {"risks": [{"task_name": "Plan", "score": makespan, "reason": "makespan"}]}
+        return self.schema.model_validate(data)
+
+
+def seed_state(width):
+    return {
+        "tasks": TaskList(task=[A, B]),
+        "dependencies": [],
+        "team": Team(team_members=[ALICE, BOB]),
+        "schedule": Schedule(
+            schedule=[
+                TaskSchedule(task=A, start_day=0, end_day=10),
+                TaskSchedule(task=B, start_day=0, end_day=10),
+            ]
+        ),
+        "task_allocations": TaskAllocationList(
+            task_allocations=[
+                TaskAllocation(task=A, team_member=ALICE),
+                TaskAllocation(task=B, team_member=BOB),
+            ]
+        ),
+        "risks": RiskList(risks=[Risk(task_name="Plan", score=10, reason="makespan")]),
+        "insights": [],
+        "project_risk_score_iterations": [10],
+        "iteration_number": 1,
+        "beam_width": width,
+        "beam": [],
+        "calendar": WorkCalendar(),
+        "start_date": date(2026, 10, 19),
+    }
+
+
+@pytest.mark.parametrize("width", [1, 2])
+def test_beam_keeps_best_candidates(monkeypatch, width):
+    # Only the first `width` proposals are evaluated
+    monkeypatch.setattr(nodes, "llm", StubLLM(["stretch 1", "stretch 5", "stretch 3"]))
+    out = nodes.beam_optimizer_node(seed_state(width))
+
+    assert [p.score for p in out["beam"]] == [1, 5][:width]
+    assert out["insights"] == ["stretch 1"]
+    assert out["project_risk_score_iterations"] == [10, 1]
+    assert {i.end_day for i in out["schedule"].schedule} == {1}
+    assert out["risks"] == out["beam"][0].risks
+
+
+def test_beam_parent_survives_worse_proposals(monkeypatch):
+    monkeypatch.setattr(nodes, "llm", StubLLM(["stretch 20", "stretch 30"]))
+    state = seed_state(2)
+    out = nodes.beam_optimizer_node(state)
+
+    assert [p.score for p in out["beam"]] == [10, 20]
+    assert out["insights"] == []
+    assert out["schedule"] == state["schedule"]
+
+
+def test_beam_children_extend_parent_insights(monkeypatch):
+    monkeypatch.setattr(nodes, "llm", StubLLM(["stretch 2"]))
+    state = seed_state(1)
+    parent = PlanCandidate(
+        insights=["stretch 4"],
+        schedule=state["schedule"],
+        task_allocations=state["task_allocations"],
+        risks=state["risks"],
+        score=4,
+    )
+    out = nodes.beam_optimizer_node({**state, "beam": [parent]})
+    assert out["insights"] == ["stretch 4", "stretch 2"]
+
+
+def test_allocator_keeps_previous_assignee_on_equal_fit():
+    state = {
+        "tasks": TaskList(task=[A]),
+        "team": Team(team_members=[ALICE, CAROL]),
+        "task_allocations": TaskAllocationList(
+            task_allocations=[TaskAllocation(task=A, team_member=CAROL)]
+        ),
+    }
+    allocs = nodes.resource_allocation_node(state)["task_allocations"]
+    assert allocs.task_allocations[0].team_member.name == "Carol"
@@ -0,0 +1,121 @@
+from datetime import date
+
+import src.replan as replan
+from src.models import (
+    Task,
+    TaskList,
+    Team,
+    TeamMember,
+    Dependency,
+    DependencyList,
+    Schedule,
+    TaskSchedule,
+    TaskAllocation,
+    TaskAllocationList,
+    TaskEdit,
+    PlanDiff,
+    WorkCalendar,
+)
+
+ALICE = TeamMember(name="Alice", role="Dev", skills=["Python"], seniority="Senior")
+BOB = TeamMember(name="Bob", role="Frontend", skills=["React"], seniority="Mid")
+CAROL = TeamMember(name="Carol", role="Dev", skills=["Python"], seniority="Mid")
+
+
+def base_state():
+    # a -> b -> c, with the a -> b edge keyed by name as the mapper often does
+    a = Task(id="a", task_name="A", estimated_day=2, required_skill="Python")
+    b = Task(id="b", task_name="B", estimated_day=2, required_skill="Python")
+    c = Task(id="c", task_name="C", estimated_day=1, required_skill="React")
+    return {
+        "project_description": "Demo",
+        "team": Team(team_members=[ALICE, BOB, CAROL]),
+        "tasks": TaskList(task=[a, b, c]),
+        "dependencies": [
+            Dependency(task_id="B", dependent_on=["A"]),
+            Dependency(task_id="c", dependent_on=["b"]),
+        ],
+        "schedule": Schedule(
+            schedule=[
+                TaskSchedule(task=a, start_day=0, end_day=2),
+                TaskSchedule(task=b, start_day=2, end_day=4),
+                TaskSchedule(task=c, start_day=4, end_day=5),
+            ]
+        ),
+        "task_allocations": TaskAllocationList(
+            task_allocations=[
+                TaskAllocation(task=a, team_member=ALICE),
+                TaskAllocation(task=b, team_member=ALICE),
+                TaskAllocation(task=c, team_member=BOB),
+            ]
+        ),
+        "calendar": WorkCalendar(),
+        "start_date": date(2026, 10, 19),
+    }
+
+
+def spans(state):
+    return {i.task.id: (i.start_day, i.end_day) for i in state["schedule"].schedule}
+
+
+def edges(state):
+    return {(d.task_id, p) for d in state["dependencies"] for p in d.dependent_on}
+
+
+def owners(state):
+    return {a.task.id: a.team_member.name for a in state["task_allocations"].task_allocations}
+
+
+def test_longer_estimate_moves_descendants():
+    diff = PlanDiff(edit_tasks=[TaskEdit(id="a", estimated_day=4)])
+    state = replan.apply_diff(base_state(), diff, audit=False)
+    assert spans(state) == {"a": (0, 4), "b": (4, 6), "c": (6, 7)}
+
+
+def test_rename_keeps_edges_keyed_by_old_name():
+    diff = PlanDiff(edit_tasks=[TaskEdit(id="a", task_name="A2")])
+    state = replan.apply_diff(base_state(), diff, audit=False)
+    assert edges(state) == {("b", "a"), ("c", "b")}
+    assert state["tasks"].task[0].task_name == "A2"
+
+
+def test_new_task_reusing_removed_id_gets_fresh_id():
+    new = Task(id="b", task_name="B2", estimated_day=1, required_skill="Python")
+    diff = PlanDiff(
+        remove_tasks=["b"],
+        add_tasks=[new],
+        add_dependencies=[Dependency(task_id="b", dependent_on=["a"])],
+    )
+    state = replan.apply_diff(base_state(), diff, audit=False)
+    new_id = next(t.id for t in state["tasks"].task if t.task_name == "B2")
+    assert new_id not in {"a", "b", "c"}
+    # The diff's edge follows the new id; c's edge to the removed task is gone
+    assert edges(state) == {(new_id, "a")}
+    assert spans(state)[new_id][0] >= spans(state)["a"][1]
+
+
+def test_removed_member_work_is_reallocated():
+    state = replan.apply_diff(base_state(), PlanDiff(remove_members=["Alice"]), audit=False)
+    assert owners(state) == {"a": "Carol", "b": "Carol", "c": "Bob"}
+    assert spans(state)["b"][0] >= spans(state)["a"][1]
+
+
+def test_mapper_edges_are_limited_to_new_tasks(monkeypatch):
+    class StubMapper:
+        def with_structured_output(self, *args, **kwargs):
+            return self
+
+        def invoke(self, prompt):
+            # Echoes an old edge, invents one between old tasks and adds one real edge
+            return DependencyList(
+                dependencies=[
+                    Dependency(task_id="c", dependent_on=["b"]),
+                    Dependency(task_id="a", dependent_on=["C"]),
+                    Dependency(task_id="D", dependent_on=["c", "zz"]),
+                ]
+            )
+
+    monkeypatch.setattr(replan, "llm", StubMapper())
+    new = Task(id="d", task_name="D", estimated_day=1, required_skill="React")
+    state = replan.apply_diff(base_state(), PlanDiff(add_tasks=[new]), audit=False)
+    assert edges(state) == {("b", "a"), ("c", "b"), ("d", "c")}
@@ -0,0 +1,60 @@
+from datetime import date
+
+from src.leveling import level_resources
+from src.models import (
+    Task,
+    TaskList,
+    Team,
+    TeamMember,
+    Dependency,
+    Schedule,
+    TaskSchedule,
+    TaskAllocation,
+    TaskAllocationList,
+    WorkCalendar,
+)
+from src.work_calendar import assign_dates, member_days_off, resolve_start_date
+
+ALICE = TeamMember(name="Alice", role="Dev", skills=["Python"], seniority="Senior")
+BOB = TeamMember(name="Bob", role="Frontend", skills=["React"], seniority="Mid")
+MONDAY = date(2026, 10, 19)
+
+
+def test_resolve_start_date_rolls_to_working_day():
+    calendar = WorkCalendar(holidays=[date(2026, 10, 19)])
+    assert resolve_start_date(calendar, date(2026, 10, 17)) == date(2026, 10, 20)
+
+
+def test_member_days_off_keep_dependency_order():
+    # Alice is off Tue-Thu; her task has to wait, and Bob's successor after it
+    calendar = WorkCalendar(
+        member_unavailable={"Alice": [date(2026, 10, 20), date(2026, 10, 21), date(2026, 10, 22)]}
+    )
+    a = Task(id="a", task_name="A", estimated_day=2, required_skill="Python")
+    b = Task(id="b", task_name="B", estimated_day=1, required_skill="React")
+    schedule = Schedule(
+        schedule=[
+            TaskSchedule(task=a, start_day=0, end_day=2),
+            TaskSchedule(task=b, start_day=2, end_day=3),
+        ]
+    )
+    allocations = TaskAllocationList(
+        task_allocations=[
+            TaskAllocation(task=a, team_member=ALICE),
+            TaskAllocation(task=b, team_member=BOB),
+        ]
+    )
+    days_off = member_days_off(calendar, MONDAY)
+    assert days_off == {"Alice": [1, 2, 3]}
+
+    leveled, _ = level_resources(
+        TaskList(task=[a, b]),
+        [Dependency(task_id="b", dependent_on=["a"])],
+        schedule,
+        allocations,
+        Team(team_members=[ALICE, BOB]),
+        days_off=days_off,
+    )
+    dated = {i.task.id: i for i in assign_dates(leveled, calendar, MONDAY).schedule}
+    assert dated["a"].start_date == date(2026, 10, 23)
+    assert dated["b"].start_date > dated["a"].end_date